@@ -7,7 +7,34 @@
 import os
 import sys
 import json
+import functools
+import importlib.util
 from pathlib import Path
+from typing import Optional
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+
+_BASE_DIR = Path(__file__).resolve().parent
+
+
+@functools.lru_cache(maxsize=None)
+def _env(name: str) -> Optional[str]:
+    """读取环境变量（进程内缓存，未设置的结果同样缓存）"""
+    return os.environ.get(name)
+
+
+def _package_version(name: str) -> str:
+    """读取已安装包的版本号（仅查询元数据，不导入包本身）"""
+    try:
+        from importlib import metadata
+        return metadata.version(name)
+    except ImportError:
+        # Python 3.7 没有 importlib.metadata；PackageNotFoundError 也是 ImportError 的子类
+        return '未知版本'
 
 
 def check_python_version():
@@ -26,17 +53,15 @@ def check_python_version():
 def check_config_file():
     """检查配置文件"""
     print("\n🔍 检查配置文件...")
-    config_file = Path(__file__).parent / "config.json"
-    
-    if not config_file.exists():
-        print("  ❌ config.json 不存在")
-        return False
+    config_file = _BASE_DIR / "config.json"
     
     try:
-        with open(config_file, 'r', encoding='utf-8') as f:
-            config = json.load(f)
+        config = _json_loads(config_file.read_bytes())
         print("  ✅ config.json 格式正确")
         return True
+    except FileNotFoundError:
+        print("  ❌ config.json 不存在")
+        return False
     except json.JSONDecodeError as e:
         print(f"  ❌ config.json 格式错误: {e}")
         return False
@@ -48,23 +73,14 @@ def check_dependencies():
     
     results = {}
     
-    # 检查 OpenAI
-    try:
-        import openai
-        print(f"  ✅ openai ({openai.__version__})")
-        results['openai'] = True
-    except ImportError:
-        print("  ⚠️  openai 未安装 (pip install openai)")
-        results['openai'] = False
-    
-    # 检查 Anthropic
-    try:
-        import anthropic
-        print(f"  ✅ anthropic ({anthropic.__version__})")
-        results['anthropic'] = True
-    except ImportError:
-        print("  ⚠️  anthropic 未安装 (pip install anthropic)")
-        results['anthropic'] = False
+    # 只检测是否已安装，避免导入 SDK 带来的启动开销
+    for package in ('openai', 'anthropic'):
+        if importlib.util.find_spec(package) is not None:
+            print(f"  ✅ {package} ({_package_version(package)})")
+            results[package] = True
+        else:
+            print(f"  ⚠️  {package} 未安装 (pip install {package})")
+            results[package] = False
     
     if not results['openai'] and not results['anthropic']:
         print("\n  ❌ 至少需要安装一个 LLM 客户端库")
@@ -78,9 +94,9 @@ def check_api_keys():
     print("\n🔍 检查 API Keys...")
     
     keys = {
-        'OPENAI_API_KEY': os.getenv('OPENAI_API_KEY'),
-        'ANTHROPIC_API_KEY': os.getenv('ANTHROPIC_API_KEY'),
-        'DEEPSEEK_API_KEY': os.getenv('DEEPSEEK_API_KEY'),
+        'OPENAI_API_KEY': _env('OPENAI_API_KEY'),
+        'ANTHROPIC_API_KEY': _env('ANTHROPIC_API_KEY'),
+        'DEEPSEEK_API_KEY': _env('DEEPSEEK_API_KEY'),
     }
     
     found_any = False
@@ -108,7 +124,6 @@ def check_directories():
     """检查目录结构"""
     print("\n🔍 检查目录结构...")
     
-    base_dir = Path(__file__).parent
     required_files = [
         'extractor.py',
         'extraction-prompt.md',
@@ -116,18 +131,21 @@ def check_directories():
         'README.md',
     ]
     
+    # 一次读取目录列表，代替逐个文件 stat
+    with os.scandir(_BASE_DIR) as it:
+        entries = {entry.name: entry for entry in it}
+    
     all_exist = True
     for filename in required_files:
-        filepath = base_dir / filename
-        if filepath.exists():
+        if filename in entries:
             print(f"  ✅ {filename}")
         else:
             print(f"  ❌ {filename} 不存在")
             all_exist = False
     
     # 检查输出目录
-    output_dir = base_dir / 'output'
-    if output_dir.exists():
+    output_entry = entries.get('output')
+    if output_entry is not None and output_entry.is_dir():
         print(f"  ✅ output/ 目录")
     else:
         print(f"  ⚠️  output/ 目录不存在（将自动创建）")
@@ -6,31 +6,86 @@
 
 import os
 import sys
-import json
 import argparse
+import asyncio
+import functools
+import importlib.util
 import logging
+import re
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+
+_BASE_DIR = Path(__file__).resolve().parent
+
+
+class _LazyImport:
+    """延迟导入 SDK 中的对象，首次使用时才真正导入模块"""
+    
+    def __init__(self, module_name: str, attr_name: str):
+        self._module_name = module_name
+        self._attr_name = attr_name
+        self._target = None
+    
+    def _load(self):
+        """导入模块并缓存目标对象"""
+        if self._target is None:
+            try:
+                module = importlib.import_module(self._module_name)
+            except ImportError:
+                raise ImportError(f"请安装 {self._module_name} 库: pip install {self._module_name}")
+            self._target = getattr(module, self._attr_name)
+        return self._target
+    
+    def __call__(self, *args, **kwargs):
+        return self._load()(*args, **kwargs)
+    
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self._load(), name)
+
+
+# LLM SDK 体积较大（pydantic、httpx 等），只在实际使用对应提供商时才导入
+OpenAI = _LazyImport('openai', 'OpenAI')
+AsyncOpenAI = _LazyImport('openai', 'AsyncOpenAI')
+Anthropic = _LazyImport('anthropic', 'Anthropic')
+AsyncAnthropic = _LazyImport('anthropic', 'AsyncAnthropic')
+
+
+@functools.lru_cache(maxsize=None)
+def _env(name: str) -> Optional[str]:
+    """读取环境变量（进程内缓存，未设置的结果同样缓存）"""
+    return os.environ.get(name)
 
 
 class ContentExtractor:
     """文案结构化提取器"""
     
+    # 匹配一个完整的代码块：开头 ``` 后紧跟的语言标记（可为空）及块内容，
+    # 每次匹配都消耗开、闭两个 ```，因此闭合标记不会被当作下一个块的开头
+    _CODE_BLOCK_RE = re.compile(r'```(\w*)(.*?)```', re.DOTALL)
+    
     def __init__(self, config_path: str = "config.json"):
         """初始化提取器"""
         self.config = self._load_config(config_path)
         self._setup_logging()
         self.client = None
+        self._prompt_parts = None
         
     def _load_config(self, config_path: str) -> Dict[str, Any]:
         """加载配置文件"""
-        config_file = Path(__file__).parent / config_path
-        if not config_file.exists():
-            raise FileNotFoundError(f"配置文件不存在: {config_file}")
-        
-        with open(config_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        config_file = _BASE_DIR / config_path
+        try:
+            return _json_loads(config_file.read_bytes())
+        except FileNotFoundError as e:
+            raise FileNotFoundError(f"配置文件不存在: {config_file}") from e
     
     def _setup_logging(self):
         """设置日志"""
@@ -41,7 +96,7 @@ class ContentExtractor:
         if log_config.get('console', True):
             handlers.append(logging.StreamHandler())
         if log_config.get('file'):
-            log_file = Path(__file__).parent / log_config['file']
+            log_file = _BASE_DIR / log_config['file']
             handlers.append(logging.FileHandler(log_file, encoding='utf-8'))
         
         logging.basicConfig(
@@ -51,96 +106,127 @@ class ContentExtractor:
         )
         self.logger = logging.getLogger(__name__)
     
-    def _init_llm_client(self, provider: Optional[str] = None):
-        """初始化 LLM 客户端"""
+    def _init_llm_client(self, provider: Optional[str] = None, async_client: bool = False):
+        """初始化 LLM 客户端（async_client 为 True 时返回异步客户端）"""
         if provider is None:
             provider = self.config['llm']['provider']
         
         if provider == 'openai':
-            return self._init_openai_client()
+            return self._init_openai_client(async_client)
         elif provider == 'anthropic':
-            return self._init_anthropic_client()
+            return self._init_anthropic_client(async_client)
         elif provider == 'deepseek':
-            return self._init_deepseek_client()
+            return self._init_deepseek_client(async_client)
         else:
             raise ValueError(f"不支持的 LLM 提供商: {provider}")
     
-    def _init_openai_client(self):
-        """初始化 OpenAI 客户端"""
+    def _client_options(self, sdk: str, async_client: bool = False) -> Dict[str, Any]:
+        """
+        LLM 客户端的公共参数：重试次数、超时，以及复用连接池的 HTTP 客户端
+        
+        未配置 llm.timeout 时沿用 SDK 的默认超时（非流式生成可能耗时较长）。
+        """
+        llm_config = self.config['llm']
+        options = {'max_retries': llm_config.get('max_retries', 2)}
+        if 'timeout' in llm_config:
+            options['timeout'] = llm_config['timeout']
+        
         try:
-            from openai import OpenAI
+            module = importlib.import_module(sdk)
+            import httpx
         except ImportError:
-            raise ImportError("请安装 openai 库: pip install openai")
+            # SDK 未安装时交由客户端构造时给出安装提示
+            return options
+        
+        # 使用 SDK 自带的 HTTP 客户端类，保留其默认设置（超时、重定向等）；旧版 SDK 没有该类
+        http_client_class = getattr(
+            module, 'DefaultAsyncHttpxClient' if async_client else 'DefaultHttpxClient', None
+        )
+        if http_client_class is None:
+            return options
         
+        options['http_client'] = http_client_class(
+            # HTTP/2 需要额外安装 h2（pip install httpx[http2]）
+            http2=importlib.util.find_spec('h2') is not None,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+        )
+        return options
+    
+    def _init_openai_client(self, async_client: bool = False):
+        """初始化 OpenAI 客户端"""
         api_key_env = self.config['llm'].get('api_key_env', 'OPENAI_API_KEY')
-        api_key = os.getenv(api_key_env)
+        api_key = _env(api_key_env)
         if not api_key:
             raise ValueError(f"未设置环境变量: {api_key_env}")
         
-        return OpenAI(api_key=api_key)
+        client_class = AsyncOpenAI if async_client else OpenAI
+        return client_class(api_key=api_key, **self._client_options('openai', async_client))
     
-    def _init_anthropic_client(self):
+    def _init_anthropic_client(self, async_client: bool = False):
         """初始化 Anthropic 客户端"""
-        try:
-            from anthropic import Anthropic
-        except ImportError:
-            raise ImportError("请安装 anthropic 库: pip install anthropic")
-        
         provider_config = self.config['llm']['alternative_providers']['anthropic']
         api_key_env = provider_config.get('api_key_env', 'ANTHROPIC_API_KEY')
-        api_key = os.getenv(api_key_env)
+        api_key = _env(api_key_env)
         if not api_key:
             raise ValueError(f"未设置环境变量: {api_key_env}")
         
-        return Anthropic(api_key=api_key)
+        client_class = AsyncAnthropic if async_client else Anthropic
+        return client_class(api_key=api_key, **self._client_options('anthropic', async_client))
     
-    def _init_deepseek_client(self):
+    def _init_deepseek_client(self, async_client: bool = False):
         """初始化 DeepSeek 客户端"""
-        try:
-            from openai import OpenAI
-        except ImportError:
-            raise ImportError("请安装 openai 库: pip install openai")
-        
         provider_config = self.config['llm']['alternative_providers']['deepseek']
         api_key_env = provider_config.get('api_key_env', 'DEEPSEEK_API_KEY')
-        api_key = os.getenv(api_key_env)
+        api_key = _env(api_key_env)
         if not api_key:
             raise ValueError(f"未设置环境变量: {api_key_env}")
         
         base_url = provider_config.get('base_url')
-        return OpenAI(api_key=api_key, base_url=base_url)
+        client_class = AsyncOpenAI if async_client else OpenAI
+        return client_class(api_key=api_key, base_url=base_url, **self._client_options('openai', async_client))
     
     def _load_prompt_template(self) -> str:
         """加载提示词模板"""
-        template_path = Path(__file__).parent / self.config['extraction']['prompt_template']
-        if not template_path.exists():
-            raise FileNotFoundError(f"提示词模板不存在: {template_path}")
-        
-        with open(template_path, 'r', encoding='utf-8') as f:
-            return f.read()
+        template_path = _BASE_DIR / self.config['extraction']['prompt_template']
+        try:
+            with open(template_path, 'r', encoding='utf-8') as f:
+                return f.read()
+        except FileNotFoundError as e:
+            raise FileNotFoundError(f"提示词模板不存在: {template_path}") from e
+    
+    def _get_prompt_parts(self) -> Tuple[str, str]:
+        """获取以 {{INPUT_CONTENT}} 切分后的提示词模板（只加载并切分一次）"""
+        if self._prompt_parts is None:
+            prefix, _, suffix = self._load_prompt_template().partition("{{INPUT_CONTENT}}")
+            self._prompt_parts = (prefix, suffix)
+        return self._prompt_parts
+    
+    def _build_prompt(self, content: str) -> str:
+        """将文案填入提示词模板"""
+        prefix, suffix = self._get_prompt_parts()
+        return f"{prefix}{content}{suffix}"
     
     def _read_input_content(self, input_source: Optional[str]) -> str:
         """读取输入文案"""
         if input_source is None or input_source == '-':
             # 从标准输入读取
             self.logger.info("从标准输入读取文案...")
-            content = sys.stdin.read()
+            content = sys.stdin.read().strip()
         else:
             # 从文件读取
             input_file = Path(input_source)
-            if not input_file.exists():
-                raise FileNotFoundError(f"输入文件不存在: {input_file}")
-            
             self.logger.info(f"从文件读取文案: {input_file}")
-            with open(input_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            try:
+                content = input_file.read_text(encoding='utf-8').strip()
+            except FileNotFoundError as e:
+                raise FileNotFoundError(f"输入文件不存在: {input_file}") from e
         
         # 验证内容长度
         min_length = self.config['extraction'].get('min_content_length', 100)
-        if len(content.strip()) < min_length:
+        if len(content) < min_length:
             raise ValueError(f"文案内容过短（少于 {min_length} 字符）")
         
-        return content.strip()
+        return content
     
     def _call_llm(self, prompt: str, provider: Optional[str] = None) -> str:
         """调用 LLM API"""
@@ -171,68 +257,130 @@ class ContentExtractor:
         
         return response.content[0].text
     
+    def _openai_compatible_params(self, provider: str) -> Dict[str, Any]:
+        """获取 OpenAI 兼容 API 的模型参数"""
+        if provider == 'openai':
+            provider_config = self.config['llm']
+        else:
+            provider_config = self.config['llm']['alternative_providers'][provider]
+        
+        return {
+            'model': provider_config['model'],
+            'max_tokens': provider_config['max_tokens'],
+            'temperature': provider_config.get('temperature', 0.7),
+        }
+    
     def _call_openai_compatible(self, prompt: str, provider: str) -> str:
         """调用 OpenAI 兼容的 API"""
         if self.client is None:
             self.client = self._init_llm_client(provider)
         
-        if provider == 'openai':
-            model = self.config['llm']['model']
-            max_tokens = self.config['llm']['max_tokens']
-            temperature = self.config['llm'].get('temperature', 0.7)
-        else:
-            provider_config = self.config['llm']['alternative_providers'][provider]
-            model = provider_config['model']
-            max_tokens = provider_config['max_tokens']
-            temperature = provider_config.get('temperature', 0.7)
+        params = self._openai_compatible_params(provider)
         
         response = self.client.chat.completions.create(
-            model=model,
+            model=params['model'],
             messages=[
                 {"role": "user", "content": prompt}
             ],
-            max_tokens=max_tokens,
-            temperature=temperature
+            max_tokens=params['max_tokens'],
+            temperature=params['temperature']
         )
         
         return response.choices[0].message.content
     
+    async def _acall_llm(self, client, prompt: str, provider: str) -> str:
+        """使用异步客户端调用 LLM API"""
+        if provider == 'anthropic':
+            provider_config = self.config['llm']['alternative_providers']['anthropic']
+            response = await client.messages.create(
+                model=provider_config['model'],
+                max_tokens=provider_config['max_tokens'],
+                messages=[
+                    {"role": "user", "content": prompt}
+                ]
+            )
+            return response.content[0].text
+        
+        params = self._openai_compatible_params(provider)
+        response = await client.chat.completions.create(
+            model=params['model'],
+            messages=[
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=params['max_tokens'],
+            temperature=params['temperature']
+        )
+        return response.choices[0].message.content
+    
     def _extract_lisp_code(self, response: str) -> str:
         """从响应中提取 Lisp 代码"""
-        # 尝试提取代码块
-        if "```lisp" in response:
-            start = response.find("```lisp") + 7
-            end = response.find("```", start)
-            if end != -1:
-                return response[start:end].strip()
+        # 优先取 ```lisp 代码块，其次取第一个无语言标记的代码块
+        untagged = None
+        for match in self._CODE_BLOCK_RE.finditer(response):
+            language = match.group(1).lower()
+            if language == 'lisp':
+                return match.group(2).strip()
+            if language == '' and untagged is None:
+                untagged = match.group(2).strip()
+        
+        if untagged is not None:
+            return untagged
         
         # 如果没有代码块标记，返回整个响应
         return response.strip()
     
-    def _save_output(self, content: str, output_path: Optional[str] = None) -> str:
-        """保存输出结果"""
+    def _save_output(self,
+                     content: str,
+                     output_path: Optional[str] = None,
+                     output_dir: Optional[str] = None,
+                     name: Optional[str] = None) -> str:
+        """
+        保存输出结果
+        
+        未指定 output_path 时在 output_dir（默认为配置中的输出目录）下自动生成文件名，
+        name 会加入文件名中，用于批量提取时区分不同输入。
+        """
         output_config = self.config['output']
         
         if output_path is None:
             # 生成默认输出路径
-            output_dir = Path(__file__).parent / output_config['directory']
-            output_dir.mkdir(exist_ok=True)
+            if output_dir is None:
+                output_dir = _BASE_DIR / output_config['directory']
+            else:
+                output_dir = Path(output_dir)
+            output_dir.mkdir(parents=True, exist_ok=True)
             
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             prefix = output_config['filename_prefix']
             suffix = output_config['filename_suffix']
-            filename = f"{prefix}_{timestamp}{suffix}"
+            if name:
+                filename = f"{prefix}_{name}_{timestamp}{suffix}"
+            else:
+                filename = f"{prefix}_{timestamp}{suffix}"
             output_path = output_dir / filename
         else:
             output_path = Path(output_path)
         
-        # 检查是否覆盖
-        if output_path.exists() and not output_config.get('overwrite', False):
-            raise FileExistsError(f"输出文件已存在: {output_path}，使用 --overwrite 强制覆盖")
+        # 检查是否覆盖：O_EXCL 在一次调用中完成检查和创建，避免竞争
+        overwrite = output_config.get('overwrite', False)
+        if not overwrite:
+            try:
+                os.close(os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL))
+            except FileExistsError as e:
+                raise FileExistsError(f"输出文件已存在: {output_path}，使用 --overwrite 强制覆盖") from e
         
-        # 保存文件
-        with open(output_path, 'w', encoding=output_config['encoding']) as f:
-            f.write(content)
+        # 保存文件：先写临时文件再原子替换，中途失败不会留下不完整的输出
+        tmp_path = output_path.with_name(output_path.name + '.tmp')
+        try:
+            tmp_path.write_text(content, encoding=output_config['encoding'])
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            # 清理临时文件，以及上面为占位而创建的空文件
+            if tmp_path.exists():
+                tmp_path.unlink()
+            if not overwrite and output_path.exists():
+                output_path.unlink()
+            raise
         
         self.logger.info(f"结果已保存到: {output_path}")
         return str(output_path)
@@ -257,20 +405,17 @@ class ContentExtractor:
             content = self._read_input_content(input_source)
             self.logger.info(f"成功读取文案，长度: {len(content)} 字符")
             
-            # 2. 加载提示词模板
-            template = self._load_prompt_template()
+            # 2. 构造完整提示词
+            prompt = self._build_prompt(content)
             
-            # 3. 构造完整提示词
-            prompt = template.replace("{{INPUT_CONTENT}}", content)
-            
-            # 4. 调用 LLM
+            # 3. 调用 LLM
             response = self._call_llm(prompt, provider)
             self.logger.info("成功获取 LLM 响应")
             
-            # 5. 提取 Lisp 代码
+            # 4. 提取 Lisp 代码
             lisp_code = self._extract_lisp_code(response)
             
-            # 6. 保存结果
+            # 5. 保存结果
             output_file = self._save_output(lisp_code, output_path)
             
             return output_file
@@ -278,6 +423,70 @@ class ContentExtractor:
         except Exception as e:
             self.logger.error(f"提取失败: {str(e)}")
             raise
+    
+    def extract_many(self,
+                     input_sources: List[str],
+                     output_dir: Optional[str] = None,
+                     provider: Optional[str] = None) -> List[Optional[str]]:
+        """
+        并发执行多个文件的提取流程
+        
+        Args:
+            input_sources: 输入文件路径列表
+            output_dir: 输出目录，None 表示使用配置文件中的目录
+            provider: LLM 提供商，None 表示使用配置文件中的默认值
+        
+        Returns:
+            与 input_sources 一一对应的输出文件路径，提取失败的项为 None
+        """
+        if provider is None:
+            provider = self.config['llm']['provider']
+        
+        # 输出文件名包含输入文件名，重名会互相冲突，需在调用 API 之前发现
+        names = [Path(source).name for source in input_sources]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"输入文件名重复，输出文件会互相冲突: {', '.join(duplicates)}")
+        
+        return asyncio.run(self._extract_many_async(input_sources, output_dir, provider))
+    
+    async def _extract_many_async(self,
+                                  input_sources: List[str],
+                                  output_dir: Optional[str],
+                                  provider: str) -> List[Optional[str]]:
+        """共享一个异步客户端，并发提取多个文件"""
+        self._get_prompt_parts()
+        max_concurrency = self.config['llm'].get('max_concurrency', 8)
+        semaphore = asyncio.Semaphore(max_concurrency)
+        client = self._init_llm_client(provider, async_client=True)
+        
+        loop = asyncio.get_running_loop()
+        
+        self.logger.info(f"批量提取 {len(input_sources)} 个文件，并发数: {max_concurrency}")
+        
+        async def extract_one(input_source: str) -> Optional[str]:
+            try:
+                # 文件读写放到线程池中执行，避免阻塞事件循环
+                content = await loop.run_in_executor(None, self._read_input_content, input_source)
+                prompt = self._build_prompt(content)
+                
+                async with semaphore:
+                    self.logger.info(f"调用 {provider} API: {input_source}")
+                    response = await self._acall_llm(client, prompt, provider)
+                
+                lisp_code = self._extract_lisp_code(response)
+                save = functools.partial(
+                    self._save_output, lisp_code, output_dir=output_dir, name=Path(input_source).name
+                )
+                return await loop.run_in_executor(None, save)
+            except Exception as e:
+                self.logger.error(f"提取失败 ({input_source}): {str(e)}")
+                return None
+        
+        try:
+            return await asyncio.gather(*[extract_one(source) for source in input_sources])
+        finally:
+            await client.close()
 
 
 def main():
@@ -293,6 +502,9 @@ def main():
   # 从标准输入提取
   cat input.txt | python extractor.py -o output.lisp
   
+  # 批量提取目录下的所有文件（-o 指定输出目录）
+  python extractor.py -i input/ -o output/
+  
   # 使用不同的 LLM 提供商
   python extractor.py -i input.txt --provider anthropic
   
@@ -303,13 +515,13 @@ def main():
     
     parser.add_argument(
         '-i', '--input',
-        help='输入文件路径（不指定或使用 - 表示从标准输入读取）',
+        help='输入文件或目录路径（目录表示批量提取；不指定或使用 - 表示从标准输入读取）',
         default=None
     )
     
     parser.add_argument(
         '-o', '--output',
-        help='输出文件路径（不指定则自动生成）',
+        help='输出文件路径，批量提取时为输出目录（不指定则自动生成）',
         default=None
     )
     
@@ -342,6 +554,30 @@ def main():
         if args.overwrite:
             extractor.config['output']['overwrite'] = True
         
+        # 批量提取目录下的所有文件
+        if args.input not in (None, '-') and Path(args.input).is_dir():
+            input_files = sorted(
+                str(path) for path in Path(args.input).iterdir()
+                if path.is_file() and not path.name.startswith('.')
+            )
+            if not input_files:
+                raise FileNotFoundError(f"输入目录中没有文件: {args.input}")
+            
+            output_files = extractor.extract_many(
+                input_sources=input_files,
+                output_dir=args.output,
+                provider=args.provider
+            )
+            
+            succeeded = [f for f in output_files if f is not None]
+            print(f"\n✅ 批量提取完成: 成功 {len(succeeded)}/{len(input_files)}")
+            for output_file in succeeded:
+                print(f"📄 输出文件: {output_file}")
+            
+            if len(succeeded) < len(input_files):
+                sys.exit(1)
+            return
+        
         # 执行提取
         output_file = extractor.extract(
             input_source=args.input,
@@ -4,13 +4,28 @@
 自动评估生成的智能体代码质量
 """
 
+import os
 import re
 import sys
 import json
+import functools
+from collections import Counter
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Tuple
 from dataclasses import dataclass
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_dumps(obj: Any) -> str:
+    """序列化为缩进的 JSON 字符串（安装了 orjson 时使用 orjson）"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, indent=2)
+
 
 @dataclass
 class QualityReport:
@@ -25,6 +40,20 @@ class QualityReport:
 class QualityChecker:
     """质量检查器"""
     
+    _DEFUN_RE = re.compile(r'\(defun\s+\S+\s+\(\)')
+    _THINKING_MODEL_RE = re.compile(r'\([^)]+法|\([^)]+思维|\([^)]+模型')
+    _STEP_RE = re.compile(r'第[一二三四五六七八九十]+步')
+    
+    # 分数 (0-100) 到等级的查找表：<60 F, 60-69 D, 70-79 C, 80-89 B, 90-100 A
+    _GRADE_TABLE = b'F' * 60 + b'D' * 10 + b'C' * 10 + b'B' * 10 + b'A' * 11
+    
+    # 完整度检查：各部分内容的匹配模式及期望的最小长度
+    _SECTION_RES = {
+        '目标': (re.compile(r'目标[^)]*\)'), 20),
+        '核心信念': (re.compile(r'核心信念[^)]*\)'), 30),
+        '思维模型': (re.compile(r'思维模型[^)]*\)'), 50),
+    }
+    
     def __init__(self):
         self.required_sections = [
             'defun',
@@ -40,16 +69,34 @@ class QualityChecker:
             '质量检验标准',
             '禁忌清单',
         ]
+        
+        # 以 (路径, 修改时间, 文件大小) 为键缓存报告，文件变化后缓存自然失效
+        self._check_file_cached = functools.lru_cache(maxsize=128)(self._check_file_version)
     
     def check_file(self, file_path: str) -> QualityReport:
-        """检查文件质量"""
+        """检查文件质量（同一文件未变化时复用已有报告）"""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            # 文件不可访问时不缓存，直接生成错误报告
+            return self._check_file(file_path)
+        
+        return self._check_file_cached(file_path, stat.st_mtime_ns, stat.st_size)
+    
+    def _check_file_version(self, file_path: str, mtime_ns: int, size: int) -> QualityReport:
+        """检查文件的某个版本，mtime_ns 和 size 仅作为缓存键"""
+        return self._check_file(file_path)
+    
+    def _check_file(self, file_path: str) -> QualityReport:
+        """执行质量检查"""
         try:
             content = self._read_file(file_path)
+            scan = self._scan(content)
             
             # 执行各项检查
             structure_score, structure_issues = self._check_structure(content)
-            syntax_score, syntax_issues = self._check_syntax(content)
-            content_score, content_issues = self._check_content_quality(content)
+            syntax_score, syntax_issues = self._check_syntax(content, scan)
+            content_score, content_issues = self._check_content_quality(content, scan)
             completeness_score, completeness_issues = self._check_completeness(content)
             
             # 计算总分
@@ -87,7 +134,7 @@ class QualityChecker:
                 '内容质量': f"{content_score}/100",
                 '完整度': f"{completeness_score}/100",
                 '文件大小': f"{len(content)} 字符",
-                '总行数': len(content.split('\n')),
+                '总行数': scan['line_count'],
             }
             
             return QualityReport(
@@ -110,11 +157,38 @@ class QualityChecker:
     def _read_file(self, file_path: str) -> str:
         """读取文件"""
         path = Path(file_path)
-        if not path.exists():
-            raise FileNotFoundError(f"文件不存在: {file_path}")
-        
-        with open(path, 'r', encoding='utf-8') as f:
-            return f.read()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return f.read()
+        except FileNotFoundError as e:
+            raise FileNotFoundError(f"文件不存在: {file_path}") from e
+    
+    def _scan(self, content: str) -> Dict[str, Any]:
+        """汇总各项检查共用的统计信息，每项只计算一次"""
+        return {
+            'open_count': content.count('('),
+            'close_count': content.count(')'),
+            'line_count': content.count('\n') + 1,
+            'has_chinese_comment': self._has_chinese_comment(content),
+            'has_placeholder': '...' in content or '待补充' in content or 'TODO' in content,
+            'has_example': '示例' in content or '例如' in content or '案例' in content,
+        }
+    
+    def _has_chinese_comment(self, content: str) -> bool:
+        """是否存在包含中文的注释（`;` 之后、同一行内出现汉字）"""
+        start = content.find(';')
+        while start != -1:
+            end = content.find('\n', start)
+            if end == -1:
+                end = len(content)
+            
+            comment = content[start:end]
+            # 纯 ASCII 的注释不可能含有汉字，无需逐字符检查
+            if not comment.isascii() and any('\u4e00' <= ch <= '\u9fa5' for ch in comment):
+                return True
+            
+            start = content.find(';', end)
+        return False
     
     def _check_structure(self, content: str) -> Tuple[int, List[str]]:
         """检查结构完整性"""
@@ -141,14 +215,14 @@ class QualityChecker:
         
         return max(0, score), issues
     
-    def _check_syntax(self, content: str) -> Tuple[int, List[str]]:
+    def _check_syntax(self, content: str, scan: Dict[str, Any]) -> Tuple[int, List[str]]:
         """检查 Lisp 语法"""
         score = 100
         issues = []
         
         # 检查括号配对
-        open_count = content.count('(')
-        close_count = content.count(')')
+        open_count = scan['open_count']
+        close_count = scan['close_count']
         
         if open_count != close_count:
             diff = abs(open_count - close_count)
@@ -156,19 +230,18 @@ class QualityChecker:
             issues.append(f"❌ 括号不配对: 左括号 {open_count} 个, 右括号 {close_count} 个")
         
         # 检查是否有基本的 defun 结构
-        defun_pattern = r'\(defun\s+\S+\s+\(\)'
-        if not re.search(defun_pattern, content):
+        if not self._DEFUN_RE.search(content):
             score -= 20
             issues.append("⚠️  defun 函数定义格式可能不正确")
         
         # 检查是否有中文注释
-        if not re.search(r';.*[\u4e00-\u9fa5]', content):
+        if not scan['has_chinese_comment']:
             score -= 10
             issues.append("⚠️  缺少中文注释")
         
         return max(0, score), issues
     
-    def _check_content_quality(self, content: str) -> Tuple[int, List[str]]:
+    def _check_content_quality(self, content: str, scan: Dict[str, Any]) -> Tuple[int, List[str]]:
         """检查内容质量"""
         score = 100
         issues = []
@@ -182,24 +255,24 @@ class QualityChecker:
             issues.append("⚠️  内容较短，建议丰富细节")
         
         # 检查是否有具体内容（不是空泛的占位符）
-        if '...' in content or '待补充' in content or 'TODO' in content:
+        if scan['has_placeholder']:
             score -= 15
             issues.append("⚠️  包含占位符或待完成内容")
         
         # 检查思维模型数量
-        thinking_models = re.findall(r'\([^)]+法|\([^)]+思维|\([^)]+模型', content)
+        thinking_models = self._THINKING_MODEL_RE.findall(content)
         if len(thinking_models) < 2:
             score -= 20
             issues.append("⚠️  思维模型数量偏少（建议3-5个）")
         
         # 检查是否有具体步骤
-        steps = re.findall(r'第[一二三四五六七八九十]+步', content)
+        steps = self._STEP_RE.findall(content)
         if len(steps) < 3:
             score -= 15
             issues.append("⚠️  执行步骤较少（建议3-7步）")
         
         # 检查是否有实例或示例
-        if '示例' not in content and '例如' not in content and '案例' not in content:
+        if not scan['has_example']:
             score -= 10
             issues.append("💡 建议添加示例或案例")
         
@@ -211,19 +284,12 @@ class QualityChecker:
         issues = []
         
         # 检查各部分的内容是否充实
-        sections_to_check = {
-            '目标': 20,
-            '核心信念': 30,
-            '思维模型': 50,
-        }
-        
-        for section, expected_min_length in sections_to_check.items():
+        for section, (pattern, expected_min_length) in self._SECTION_RES.items():
             if section in content:
                 # 提取该部分的内容
-                pattern = f'{section}[^)]*\\)'
-                matches = re.findall(pattern, content)
-                if matches:
-                    section_content = matches[0]
+                match = pattern.search(content)
+                if match:
+                    section_content = match.group()
                     if len(section_content) < expected_min_length:
                         score -= 15
                         issues.append(f"⚠️  '{section}' 部分内容过于简单")
@@ -237,16 +303,7 @@ class QualityChecker:
     
     def _calculate_grade(self, score: int) -> str:
         """计算等级"""
-        if score >= 90:
-            return 'A'
-        elif score >= 80:
-            return 'B'
-        elif score >= 70:
-            return 'C'
-        elif score >= 60:
-            return 'D'
-        else:
-            return 'F'
+        return chr(self._GRADE_TABLE[min(max(score, 0), 100)])
     
     def _generate_suggestions(
         self, 
@@ -367,9 +424,11 @@ def main():
     
     checker = QualityChecker()
     results = []
+    reports = []
     
     for file_path in args.files:
         report = checker.check_file(file_path)
+        reports.append((file_path, report))
         
         if args.json:
             results.append({
@@ -389,7 +448,7 @@ def main():
     
     # JSON 输出
     if args.json:
-        print(json.dumps(results, ensure_ascii=False, indent=2))
+        print(_json_dumps(results))
     
     # 如果检查了多个文件，显示汇总
     if len(args.files) > 1 and not args.json:
@@ -397,19 +456,18 @@ def main():
         print("📊 汇总统计")
         print("=" * 60)
         
-        all_reports = [checker.check_file(f) for f in args.files]
-        avg_score = sum(r.score for r in all_reports) / len(all_reports)
+        # 先取出分数列表，sum/max/min 直接在列表上完成归约
+        scores = [report.score for _, report in reports]
+        avg_score = sum(scores) / len(scores)
         
-        print(f"文件总数: {len(all_reports)}")
+        print(f"文件总数: {len(scores)}")
         print(f"平均分数: {avg_score:.1f}/100")
-        print(f"最高分数: {max(r.score for r in all_reports)}/100")
-        print(f"最低分数: {min(r.score for r in all_reports)}/100")
+        print(f"最高分数: {max(scores)}/100")
+        print(f"最低分数: {min(scores)}/100")
         print()
         
         # 等级分布
-        grade_dist = {}
-        for report in all_reports:
-            grade_dist[report.grade] = grade_dist.get(report.grade, 0) + 1
+        grade_dist = Counter(report.grade for _, report in reports)
         
         print("等级分布:")
         for grade in ['A', 'B', 'C', 'D', 'F']:
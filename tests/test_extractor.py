@@ -0,0 +1,49 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from extractor import ContentExtractor
+
+
+class ExtractLispCodeTest(unittest.TestCase):
+    """_extract_lisp_code 代码块提取"""
+    
+    def setUp(self):
+        # 只测试纯文本处理，无需加载配置和日志
+        self.extractor = ContentExtractor.__new__(ContentExtractor)
+    
+    def extract(self, response):
+        return self.extractor._extract_lisp_code(response)
+    
+    def test_lisp_block(self):
+        self.assertEqual(self.extract("说明\n```lisp\n(defun a () 1)\n```\n结束"), "(defun a () 1)")
+    
+    def test_lisp_tag_is_case_insensitive(self):
+        self.assertEqual(self.extract("```Lisp\n(defun a () 1)\n```"), "(defun a () 1)")
+    
+    def test_closing_fence_is_not_an_opener(self):
+        response = "```text\n说明\n```\n\n```lisp\n(defun a () 1)\n```"
+        self.assertEqual(self.extract(response), "(defun a () 1)")
+    
+    def test_lisp_block_preferred_over_earlier_untagged_block(self):
+        response = "```\n其他内容\n```\n\n```lisp\n(defun a () 1)\n```"
+        self.assertEqual(self.extract(response), "(defun a () 1)")
+    
+    def test_single_line_lisp_block(self):
+        self.assertEqual(self.extract("```lisp (defun a () 1)```"), "(defun a () 1)")
+    
+    def test_untagged_block_fallback(self):
+        response = "```text\n说明\n```\n\n```\n(defun a () 1)\n```"
+        self.assertEqual(self.extract(response), "(defun a () 1)")
+    
+    def test_no_block_returns_whole_response(self):
+        self.assertEqual(self.extract("  (defun a () 1)\n"), "(defun a () 1)")
+    
+    def test_unclosed_block_returns_whole_response(self):
+        self.assertEqual(self.extract("```lisp\n(defun a () 1)"), "```lisp\n(defun a () 1)")
+
+
+if __name__ == '__main__':
+    unittest.main()